@@ -13,17 +13,19 @@ from botocore.exceptions import ClientError
 
 # Import utilities
 try:
-    from utils.response import created_response, bad_request_response, server_error_response
+    from utils.response import created_response, bad_request_response, server_error_response, service_unavailable_response
+    from utils.retry import DYNAMODB_CONFIG, TableSaturatedError, call_with_retry
     from utils.validation import validate_user_data, sanitize_user_data
 except ImportError:
     # Fallback for local development
     import sys
     sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-    from utils.response import created_response, bad_request_response, server_error_response
+    from utils.response import created_response, bad_request_response, server_error_response, service_unavailable_response
+    from utils.retry import DYNAMODB_CONFIG, TableSaturatedError, call_with_retry
     from utils.validation import validate_user_data, sanitize_user_data
 
 # Initialize DynamoDB client
-dynamodb = boto3.resource('dynamodb')
+dynamodb = boto3.resource('dynamodb', config=DYNAMODB_CONFIG)
 table_name = os.environ.get('USERS_TABLE', 'Users')
 table = dynamodb.Table(table_name)
 
@@ -79,12 +81,19 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             user_item['age'] = sanitized_data['age']
         
         # Save to DynamoDB
-        table.put_item(Item=user_item)
+        call_with_retry(table.put_item, Item=user_item)
         
         print(f"Successfully created user: {user_id}")
         
         return created_response(user_item)
         
+    except TableSaturatedError as e:
+        print(f"DynamoDB saturated: {str(e)}")
+        return service_unavailable_response(
+            "Service is temporarily overloaded, please retry later",
+            e.retry_after
+        )
+        
     except ClientError as e:
         print(f"DynamoDB error: {str(e)}")
         error_code = e.response['Error']['Code']
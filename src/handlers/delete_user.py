@@ -11,15 +11,17 @@ from botocore.exceptions import ClientError
 
 # Import utilities
 try:
-    from utils.response import success_response, not_found_response, bad_request_response, server_error_response
+    from utils.response import success_response, not_found_response, bad_request_response, server_error_response, service_unavailable_response
+    from utils.retry import DYNAMODB_CONFIG, TableSaturatedError, call_with_retry
 except ImportError:
     # Fallback for local development
     import sys
     sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-    from utils.response import success_response, not_found_response, bad_request_response, server_error_response
+    from utils.response import success_response, not_found_response, bad_request_response, server_error_response, service_unavailable_response
+    from utils.retry import DYNAMODB_CONFIG, TableSaturatedError, call_with_retry
 
 # Initialize DynamoDB client
-dynamodb = boto3.resource('dynamodb')
+dynamodb = boto3.resource('dynamodb', config=DYNAMODB_CONFIG)
 table_name = os.environ.get('USERS_TABLE', 'Users')
 table = dynamodb.Table(table_name)
 
@@ -49,12 +51,12 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             return bad_request_response("Invalid userId")
         
         # Check if user exists before deleting
-        get_response = table.get_item(Key={'userId': user_id})
+        get_response = call_with_retry(table.get_item, Key={'userId': user_id})
         if 'Item' not in get_response:
             return not_found_response(f"User with ID {user_id} not found")
         
         # Delete the user
-        table.delete_item(Key={'userId': user_id})
+        call_with_retry(table.delete_item, Key={'userId': user_id})
         
         print(f"Successfully deleted user: {user_id}")
         
@@ -63,6 +65,13 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'userId': user_id
         })
         
+    except TableSaturatedError as e:
+        print(f"DynamoDB saturated: {str(e)}")
+        return service_unavailable_response(
+            "Service is temporarily overloaded, please retry later",
+            e.retry_after
+        )
+        
     except ClientError as e:
         print(f"DynamoDB error: {str(e)}")
         error_code = e.response['Error']['Code']
@@ -11,15 +11,17 @@ from botocore.exceptions import ClientError
 
 # Import utilities
 try:
-    from utils.response import success_response, not_found_response, bad_request_response, server_error_response
+    from utils.response import success_response, not_found_response, bad_request_response, server_error_response, service_unavailable_response
+    from utils.retry import DYNAMODB_CONFIG, TableSaturatedError, call_with_retry
 except ImportError:
     # Fallback for local development
     import sys
     sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-    from utils.response import success_response, not_found_response, bad_request_response, server_error_response
+    from utils.response import success_response, not_found_response, bad_request_response, server_error_response, service_unavailable_response
+    from utils.retry import DYNAMODB_CONFIG, TableSaturatedError, call_with_retry
 
 # Initialize DynamoDB client
-dynamodb = boto3.resource('dynamodb')
+dynamodb = boto3.resource('dynamodb', config=DYNAMODB_CONFIG)
 table_name = os.environ.get('USERS_TABLE', 'Users')
 table = dynamodb.Table(table_name)
 
@@ -49,7 +51,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             return bad_request_response("Invalid userId")
         
         # Get user from DynamoDB
-        response = table.get_item(Key={'userId': user_id})
+        response = call_with_retry(table.get_item, Key={'userId': user_id})
         
         # Check if user exists
         if 'Item' not in response:
@@ -60,6 +62,13 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         
         return success_response(user)
         
+    except TableSaturatedError as e:
+        print(f"DynamoDB saturated: {str(e)}")
+        return service_unavailable_response(
+            "Service is temporarily overloaded, please retry later",
+            e.retry_after
+        )
+        
     except ClientError as e:
         print(f"DynamoDB error: {str(e)}")
         error_code = e.response['Error']['Code']
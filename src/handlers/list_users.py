@@ -11,15 +11,17 @@ from botocore.exceptions import ClientError
 
 # Import utilities
 try:
-    from utils.response import success_response, server_error_response
+    from utils.response import success_response, server_error_response, service_unavailable_response
+    from utils.retry import DYNAMODB_CONFIG, TableSaturatedError, call_with_retry
 except ImportError:
     # Fallback for local development
     import sys
     sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-    from utils.response import success_response, server_error_response
+    from utils.response import success_response, server_error_response, service_unavailable_response
+    from utils.retry import DYNAMODB_CONFIG, TableSaturatedError, call_with_retry
 
 # Initialize DynamoDB client
-dynamodb = boto3.resource('dynamodb')
+dynamodb = boto3.resource('dynamodb', config=DYNAMODB_CONFIG)
 table_name = os.environ.get('USERS_TABLE', 'Users')
 table = dynamodb.Table(table_name)
 
@@ -59,7 +61,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             except json.JSONDecodeError:
                 pass  # Ignore invalid pagination token
         
-        response = table.scan(**scan_kwargs)
+        response = call_with_retry(table.scan, **scan_kwargs)
         
         users = response.get('Items', [])
         
@@ -80,6 +82,13 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         
         return success_response(result)
         
+    except TableSaturatedError as e:
+        print(f"DynamoDB saturated: {str(e)}")
+        return service_unavailable_response(
+            "Service is temporarily overloaded, please retry later",
+            e.retry_after
+        )
+        
     except ClientError as e:
         print(f"DynamoDB error: {str(e)}")
         error_code = e.response['Error']['Code']
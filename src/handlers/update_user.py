@@ -12,17 +12,19 @@ from botocore.exceptions import ClientError
 
 # Import utilities
 try:
-    from utils.response import success_response, not_found_response, bad_request_response, server_error_response
+    from utils.response import success_response, not_found_response, bad_request_response, server_error_response, service_unavailable_response
+    from utils.retry import DYNAMODB_CONFIG, TableSaturatedError, call_with_retry
     from utils.validation import validate_user_data, sanitize_user_data
 except ImportError:
     # Fallback for local development
     import sys
     sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-    from utils.response import success_response, not_found_response, bad_request_response, server_error_response
+    from utils.response import success_response, not_found_response, bad_request_response, server_error_response, service_unavailable_response
+    from utils.retry import DYNAMODB_CONFIG, TableSaturatedError, call_with_retry
     from utils.validation import validate_user_data, sanitize_user_data
 
 # Initialize DynamoDB client
-dynamodb = boto3.resource('dynamodb')
+dynamodb = boto3.resource('dynamodb', config=DYNAMODB_CONFIG)
 table_name = os.environ.get('USERS_TABLE', 'Users')
 table = dynamodb.Table(table_name)
 
@@ -67,7 +69,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             return bad_request_response(error_message)
         
         # Check if user exists
-        get_response = table.get_item(Key={'userId': user_id})
+        get_response = call_with_retry(table.get_item, Key={'userId': user_id})
         if 'Item' not in get_response:
             return not_found_response(f"User with ID {user_id} not found")
         
@@ -111,13 +113,20 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         if expression_attribute_names:
             update_kwargs['ExpressionAttributeNames'] = expression_attribute_names
         
-        response = table.update_item(**update_kwargs)
+        response = call_with_retry(table.update_item, **update_kwargs)
         
         updated_user = response['Attributes']
         print(f"Successfully updated user: {user_id}")
         
         return success_response(updated_user)
         
+    except TableSaturatedError as e:
+        print(f"DynamoDB saturated: {str(e)}")
+        return service_unavailable_response(
+            "Service is temporarily overloaded, please retry later",
+            e.retry_after
+        )
+        
     except ClientError as e:
         print(f"DynamoDB error: {str(e)}")
         error_code = e.response['Error']['Code']
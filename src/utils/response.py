@@ -63,6 +63,17 @@ def server_error_response(message: str = "Internal server error") -> Dict[str, A
     return error_response(message, 500)
 
 
+def service_unavailable_response(
+    message: str = "Service temporarily unavailable",
+    retry_after: int = 1
+) -> Dict[str, Any]:
+    """Create a 503 Service Unavailable response with a Retry-After header"""
+    return create_response(503, {'error': message}, {
+        'Retry-After': str(retry_after),
+        'Access-Control-Expose-Headers': 'Retry-After'
+    })
+
+
 def created_response(body: Any) -> Dict[str, Any]:
     """Create a 201 Created response"""
     return success_response(body, 201)
@@ -0,0 +1,269 @@
+"""
+Client-side throttling, retry budget and circuit breaker for DynamoDB calls
+
+State lives at module level so it is shared by every invocation served by the
+same Lambda execution environment.
+"""
+import json
+import math
+import os
+import random
+import time
+from typing import Any, Callable, Dict, Optional
+
+from botocore.config import Config
+from botocore.exceptions import ClientError, HTTPClientError
+from botocore.exceptions import ConnectionError as BotoConnectionError
+
+
+# Retries are handled here, so botocore's own retry loop is switched off to
+# avoid retries multiplying on top of each other. This also drops botocore's
+# DynamoDB x-amz-crc32 checksum retry, which is not visible through the
+# resource API.
+DYNAMODB_CONFIG = Config(retries={'mode': 'standard', 'total_max_attempts': 1})
+
+# Mirrors botocore.retries.standard.ThrottledRetryableChecker
+THROTTLING_ERROR_CODES = {
+    'Throttling',
+    'ThrottlingException',
+    'ThrottledException',
+    'RequestThrottledException',
+    'TooManyRequestsException',
+    'ProvisionedThroughputExceededException',
+    'TransactionInProgressException',
+    'RequestLimitExceeded',
+    'BandwidthLimitExceeded',
+    'LimitExceededException',
+    'RequestThrottled',
+    'SlowDown',
+    'PriorRequestNotComplete',
+    'EC2ThrottledException',
+}
+
+# Mirrors botocore.retries.standard.TransientRetryableChecker
+TRANSIENT_ERROR_CODES = {
+    'RequestTimeout',
+    'RequestTimeoutException',
+    'PriorRequestNotComplete',
+}
+
+# The legacy botocore DynamoDB policy allowed 10 attempts with up to ~25s of
+# sleep. These defaults keep 10 attempts but cap the total at ~12s of sleep so
+# a request still answers well inside the 29s API Gateway timeout.
+MAX_ATTEMPTS = int(os.environ.get('DDB_RETRY_MAX_ATTEMPTS', 10))
+BASE_DELAY = float(os.environ.get('DDB_RETRY_BASE_DELAY', 0.05))
+MAX_DELAY = float(os.environ.get('DDB_RETRY_MAX_DELAY', 3.0))
+
+RETRY_BUDGET_CAPACITY = int(os.environ.get('DDB_RETRY_BUDGET_CAPACITY', 500))
+RETRY_COST = 5
+NO_RETRY_INCREMENT = 1
+
+BREAKER_FAILURE_THRESHOLD = int(os.environ.get('DDB_BREAKER_FAILURE_THRESHOLD', 5))
+BREAKER_COOLDOWN = float(os.environ.get('DDB_BREAKER_COOLDOWN', 10.0))
+
+METRICS_NAMESPACE = os.environ.get('METRICS_NAMESPACE', 'UsersApi')
+SERVICE_NAME = os.environ.get('POWERTOOLS_SERVICE_NAME', 'users-api')
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class TableSaturatedError(Exception):
+    """Raised when DynamoDB keeps throttling and the caller should back off"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class RetryBudget:
+    """Token bucket limiting how many retries this environment may spend"""
+
+    def __init__(self, capacity: int = RETRY_BUDGET_CAPACITY):
+        self.capacity = capacity
+        self.tokens = capacity
+
+    def acquire(self) -> bool:
+        """Take tokens for one retry, returns False if the budget is spent"""
+        if self.tokens < RETRY_COST:
+            return False
+        self.tokens -= RETRY_COST
+        return True
+
+    def release(self, amount: int) -> None:
+        """Give tokens back after a successful call"""
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class CircuitBreaker:
+    """Fails fast while the table is known to be saturated"""
+
+    def __init__(
+        self,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        cooldown: float = BREAKER_COOLDOWN
+    ):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+
+    def retry_after(self) -> int:
+        """Seconds until the breaker lets a trial call through"""
+        remaining = self.opened_at + self.cooldown - time.monotonic()
+        return max(1, math.ceil(remaining))
+
+    def allow_request(self) -> bool:
+        """Check whether a call may go to DynamoDB"""
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.cooldown:
+                return False
+            self._transition(HALF_OPEN)
+        return True
+
+    def record_success(self) -> None:
+        """Reset the breaker after a call that was not throttled"""
+        self.failures = 0
+        if self.state != CLOSED:
+            self._transition(CLOSED)
+
+    def record_throttle(self) -> None:
+        """Count a call that stayed throttled after all retries"""
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            if self.state != OPEN:
+                self._transition(OPEN)
+
+    def _transition(self, state: str) -> None:
+        print(f"Circuit breaker: {self.state} -> {state}")
+        self.state = state
+        emit_metrics({'CircuitBreakerOpen': 1 if state == OPEN else 0})
+
+
+_budget = RetryBudget()
+_breaker = CircuitBreaker()
+
+
+def emit_metrics(metrics: Dict[str, float], operation: Optional[str] = None) -> None:
+    """
+    Emit metrics to CloudWatch using the Embedded Metric Format
+
+    Args:
+        metrics: Mapping of metric name to value (all reported as Count)
+        operation: Optional DynamoDB operation name added as a dimension
+    """
+    dimensions = ['service']
+    record: Dict[str, Any] = {'service': SERVICE_NAME}
+    if operation:
+        dimensions.append('operation')
+        record['operation'] = operation
+
+    record['_aws'] = {
+        'Timestamp': int(time.time() * 1000),
+        'CloudWatchMetrics': [{
+            'Namespace': METRICS_NAMESPACE,
+            'Dimensions': [dimensions],
+            'Metrics': [{'Name': name, 'Unit': 'Count'} for name in metrics]
+        }]
+    }
+    record.update(metrics)
+    print(json.dumps(record))
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff for the given retry attempt"""
+    return random.uniform(0, min(MAX_DELAY, BASE_DELAY * (2 ** attempt)))
+
+
+def _classify(error: Exception) -> Optional[str]:
+    """Return 'throttle', 'transient' or None if the error is not retryable"""
+    if isinstance(error, ClientError):
+        code = error.response.get('Error', {}).get('Code')
+        if code in THROTTLING_ERROR_CODES:
+            return 'throttle'
+        if code in TRANSIENT_ERROR_CODES:
+            return 'transient'
+        status = error.response.get('ResponseMetadata', {}).get('HTTPStatusCode')
+        if status is not None and status >= 500:
+            return 'transient'
+        return None
+    if isinstance(error, (BotoConnectionError, HTTPClientError)):
+        return 'transient'
+    return None
+
+
+def call_with_retry(operation: Callable[..., Any], **kwargs: Any) -> Any:
+    """
+    Call a DynamoDB table operation with backoff, retry budget and circuit breaker
+
+    Args:
+        operation: Bound table method, e.g. table.get_item
+        **kwargs: Arguments passed to the operation
+
+    Returns:
+        The operation's response
+
+    Raises:
+        TableSaturatedError: If the table is throttling and the call was given up
+        ClientError: For non-retryable errors or when transient retries run out
+    """
+    name = getattr(operation, '__name__', 'unknown')
+
+    if not _breaker.allow_request():
+        emit_metrics({'CircuitBreakerRejected': 1}, name)
+        raise TableSaturatedError(
+            "DynamoDB table is saturated, circuit breaker open",
+            _breaker.retry_after()
+        )
+
+    retries = 0
+    while True:
+        try:
+            response = operation(**kwargs)
+        except (ClientError, BotoConnectionError, HTTPClientError) as e:
+            kind = _classify(e)
+            if kind is None:
+                raise
+
+            # A half-open probe gets a single attempt
+            if _breaker.state == HALF_OPEN:
+                emit_metrics({'Retries': 0, 'HalfOpenProbeFailed': 1}, name)
+                if kind != 'throttle':
+                    raise
+                _breaker.record_throttle()
+                raise TableSaturatedError(
+                    f"DynamoDB table is still saturated: {e}",
+                    _breaker.retry_after()
+                ) from e
+
+            exhausted = retries + 1 >= MAX_ATTEMPTS
+            if exhausted or not _budget.acquire():
+                emit_metrics({
+                    'Retries': retries,
+                    'RetriesExhausted': 1 if exhausted else 0,
+                    'RetryBudgetExhausted': 0 if exhausted else 1
+                }, name)
+                if kind != 'throttle':
+                    raise
+                _breaker.record_throttle()
+                raise TableSaturatedError(
+                    f"DynamoDB table is saturated: {e}",
+                    _breaker.retry_after() if _breaker.state == OPEN else 1
+                ) from e
+
+            delay = _backoff_delay(retries)
+            retries += 1
+            print(f"Retrying {name} after {kind} error in {delay:.3f}s (retry {retries})")
+            time.sleep(delay)
+            continue
+
+        _breaker.record_success()
+        if retries:
+            _budget.release(RETRY_COST)
+            emit_metrics({'Retries': retries}, name)
+        else:
+            _budget.release(NO_RETRY_INCREMENT)
+        return response
@@ -0,0 +1,11 @@
+"""
+Shared pytest setup: put src/ on the path the same way the Lambda runtime does
+"""
+import os
+import sys
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
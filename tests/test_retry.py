@@ -0,0 +1,203 @@
+"""
+Tests for the DynamoDB retry budget and circuit breaker
+"""
+import json
+
+import boto3
+import pytest
+from botocore.stub import Stubber
+from botocore.exceptions import ClientError
+
+from utils import retry
+from handlers import get_user
+
+
+KEY = {'userId': {'S': 'abc'}}
+
+
+class FakeClock:
+    """Stand-in for time.monotonic that only moves when told to"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(retry.time, 'monotonic', fake)
+    return fake
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    calls = []
+    monkeypatch.setattr(retry.time, 'sleep', calls.append)
+    return calls
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch, clock, sleeps):
+    monkeypatch.setattr(retry, '_budget', retry.RetryBudget())
+    monkeypatch.setattr(retry, '_breaker', retry.CircuitBreaker())
+
+
+@pytest.fixture
+def table():
+    resource = boto3.resource('dynamodb', config=retry.DYNAMODB_CONFIG)
+    table = resource.Table('Users')
+    with Stubber(table.meta.client) as stubber:
+        yield table, stubber
+        stubber.assert_no_pending_responses()
+
+
+def add_throttles(stubber, count):
+    for _ in range(count):
+        stubber.add_client_error(
+            'get_item',
+            service_error_code='ProvisionedThroughputExceededException',
+            http_status_code=400
+        )
+
+
+def add_success(stubber):
+    stubber.add_response('get_item', {'Item': {'userId': {'S': 'abc'}}})
+
+
+def saturate(table, stubber):
+    """Run one call that stays throttled through every attempt"""
+    add_throttles(stubber, retry.MAX_ATTEMPTS)
+    with pytest.raises(retry.TableSaturatedError) as exc_info:
+        retry.call_with_retry(table.get_item, Key={'userId': 'abc'})
+    return exc_info.value
+
+
+def test_backoff_is_capped(monkeypatch):
+    monkeypatch.setattr(retry.random, 'uniform', lambda low, high: high)
+
+    assert retry._backoff_delay(0) == retry.BASE_DELAY
+    assert retry._backoff_delay(3) == retry.BASE_DELAY * 8
+    assert retry._backoff_delay(30) == retry.MAX_DELAY
+
+
+def test_retries_throttle_then_succeeds(table, sleeps):
+    table, stubber = table
+    add_throttles(stubber, 2)
+    add_success(stubber)
+
+    response = retry.call_with_retry(table.get_item, Key={'userId': 'abc'})
+
+    assert response['Item'] == {'userId': 'abc'}
+    assert len(sleeps) == 2
+    assert all(0 <= delay <= retry.MAX_DELAY for delay in sleeps)
+
+
+def test_retries_server_errors_by_status_code(table, sleeps):
+    table, stubber = table
+    stubber.add_client_error('get_item', service_error_code='Whatever', http_status_code=502)
+    add_success(stubber)
+
+    retry.call_with_retry(table.get_item, Key={'userId': 'abc'})
+
+    assert len(sleeps) == 1
+
+
+def test_non_retryable_error_passes_through(table, sleeps):
+    table, stubber = table
+    stubber.add_client_error(
+        'get_item',
+        service_error_code='ConditionalCheckFailedException',
+        http_status_code=400
+    )
+
+    with pytest.raises(ClientError) as exc_info:
+        retry.call_with_retry(table.get_item, Key={'userId': 'abc'})
+
+    assert exc_info.value.response['Error']['Code'] == 'ConditionalCheckFailedException'
+    assert sleeps == []
+    assert retry._budget.tokens == retry._budget.capacity
+
+
+def test_budget_drains_and_is_refunded(table, monkeypatch, sleeps):
+    table, stubber = table
+    monkeypatch.setattr(retry, '_budget', retry.RetryBudget(capacity=12))
+
+    add_throttles(stubber, 1)
+    add_success(stubber)
+    retry.call_with_retry(table.get_item, Key={'userId': 'abc'})
+    assert retry._budget.tokens == 12
+
+    add_throttles(stubber, 3)
+    with pytest.raises(retry.TableSaturatedError):
+        retry.call_with_retry(table.get_item, Key={'userId': 'abc'})
+    assert retry._budget.tokens == 2
+    assert len(sleeps) == 3
+
+    add_success(stubber)
+    retry.call_with_retry(table.get_item, Key={'userId': 'abc'})
+    assert retry._budget.tokens == 3
+
+
+def test_breaker_opens_half_opens_and_closes(table, clock):
+    table, stubber = table
+
+    for _ in range(retry.BREAKER_FAILURE_THRESHOLD - 1):
+        error = saturate(table, stubber)
+        assert retry._breaker.state == retry.CLOSED
+        assert error.retry_after == 1
+
+    error = saturate(table, stubber)
+    assert retry._breaker.state == retry.OPEN
+    assert error.retry_after == retry.math.ceil(retry.BREAKER_COOLDOWN)
+
+    clock.now += retry.BREAKER_COOLDOWN
+    add_success(stubber)
+    retry.call_with_retry(table.get_item, Key={'userId': 'abc'})
+
+    assert retry._breaker.state == retry.CLOSED
+    assert retry._breaker.failures == 0
+
+
+def test_breaker_rejects_while_open(table, clock):
+    table, stubber = table
+    for _ in range(retry.BREAKER_FAILURE_THRESHOLD):
+        saturate(table, stubber)
+
+    clock.now += 4.5
+    with pytest.raises(retry.TableSaturatedError) as exc_info:
+        retry.call_with_retry(table.get_item, Key={'userId': 'abc'})
+
+    assert exc_info.value.retry_after == 6
+
+
+def test_half_open_probe_makes_single_attempt(table, clock, sleeps):
+    table, stubber = table
+    for _ in range(retry.BREAKER_FAILURE_THRESHOLD):
+        saturate(table, stubber)
+    tokens = retry._budget.tokens
+    sleeps.clear()
+
+    clock.now += retry.BREAKER_COOLDOWN
+    add_throttles(stubber, 1)
+    with pytest.raises(retry.TableSaturatedError):
+        retry.call_with_retry(table.get_item, Key={'userId': 'abc'})
+
+    assert retry._breaker.state == retry.OPEN
+    assert sleeps == []
+    assert retry._budget.tokens == tokens
+
+
+def test_handler_returns_503_when_saturated():
+    event = {'pathParameters': {'userId': 'abc'}}
+
+    with Stubber(get_user.table.meta.client) as stubber:
+        add_throttles(stubber, retry.MAX_ATTEMPTS)
+        response = get_user.lambda_handler(event, None)
+
+    assert response['statusCode'] == 503
+    assert response['headers']['Retry-After'] == '1'
+    assert response['headers']['Access-Control-Expose-Headers'] == 'Retry-After'
+    assert 'error' in json.loads(response['body'])